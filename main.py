@@ -3,14 +3,41 @@
 # Save as schnopdih_v6_fixed.py and run: python schnopdih_v6_fixed.py
 
 import os
+import re
 import sys
 import json
+import hashlib
+import time
+import heapq
 import shutil
-import tempfile
+import subprocess
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from urllib.parse import urlparse
-from typing import List, Dict, Optional
+from functools import lru_cache, partial
+from itertools import islice
+from urllib.parse import urlparse, quote_plus
+from typing import List, Dict, Optional, Deque, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 # Prefer software rendering for WebEngine on some Windows GPUs to avoid flicker
 os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--disable-gpu --disable-gpu-compositing --disable-software-rasterizer")
@@ -23,7 +50,12 @@ from PyQt5.QtCore import (
     QTimer,
     QPropertyAnimation,
     QEasingCurve,
+    QRunnable,
+    QAbstractListModel,
+    QModelIndex,
+    QThreadPool,
     pyqtSignal,
+    pyqtSlot,
 )
 from PyQt5.QtGui import QColor, QPalette, QKeySequence
 from PyQt5.QtWidgets import (
@@ -40,6 +72,7 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QListWidget,
     QListWidgetItem,
+    QListView,
     QMenu,
     QStyle,
     QLabel,
@@ -55,6 +88,7 @@ from PyQt5.QtWebEngineWidgets import (
     QWebEngineProfile,
     QWebEngineSettings,
     QWebEnginePage,
+    QWebEngineScript,
 )
 from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor
 
@@ -70,14 +104,24 @@ HISTORY_FILE = DATA_DIR / "history.json"
 SESSION_FILE = DATA_DIR / "session.json"
 EXTENSIONS_DIR = DATA_DIR / "extensions"
 EXTENSIONS_DIR.mkdir(exist_ok=True)
+EXTENSIONS_SCRIPT_NAME = f"{APP_NAME}_extensions"
 DOWNLOADS_DIR = DATA_DIR / "downloads"
 DOWNLOADS_DIR.mkdir(exist_ok=True)
 CACHE_DIR = DATA_DIR / "cache"
 STORAGE_DIR = DATA_DIR / "storage"
 CACHE_DIR.mkdir(exist_ok=True)
 STORAGE_DIR.mkdir(exist_ok=True)
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024  # chromium trims the disk cache itself past this
+# cache-only trees chromium keeps under the persistent storage path; cookies, local storage and
+# IndexedDB live alongside them and are left alone by "Clear Cache"
+STORAGE_CACHE_SUBDIRS = ("GPUCache", "Code Cache", "Service Worker/ScriptCache", "Application Cache")
 
 DEFAULT_HOMEPAGE = "https://www.google.com/"
+SEARCH_URL = "https://www.google.com/search?q="
+# omnibox input starting with one of these is taken as-is without parsing
+URL_PREFIXES = ("http://", "https://", "about:", "file://", "ftp://", "mailto:", "data:", "view-source:")
+OMNIBOX_SUGGESTIONS = 6
+HISTORY_LIMIT = 5000  # newest entries kept; older ones fall off the end of the deque
 DEFAULT_WINDOW_SIZE = (1280, 820)
 
 # Plain white page CSS (force black text on white background where possible)
@@ -107,30 +151,188 @@ MODERN_USER_AGENT = (
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
+# Shown in place of Chrome Web Store / chrome:// pages, which QtWebEngine can't serve
+CHROME_WEBSTORE_HELP_HTML = """
+<!doctype html>
+<html>
+<head><meta charset='utf-8'><title>Chrome Web Store — Not Supported</title></head>
+<body style='font-family:Segoe UI,Arial; padding:20px; background:#fff; color:#000'>
+<h2>Chrome Web Store is not supported directly in this app</h2>
+<p>QtWebEngine does not provide the Chromium Extensions APIs required to install and run Chrome Web Store extensions.</p>
+<h3>Two practical alternatives</h3>
+<ul>
+<li><strong>Install unpacked content scripts</strong>: If an extension only injects content scripts (JS that manipulates pages), you can extract those files from the extension and install them as a schnopdih "script": <em>Settings → Extensions → Install Script</em>.</li>
+<li><strong>Use a Chromium-based browser</strong> (Chrome, Edge) for extensions that need full extension APIs (background pages, chrome.runtime, webRequest, etc.).</li>
+</ul>
+<h3>Quick extract guide</h3>
+<ol>
+<li>In Chrome, enable Developer Mode on <code>chrome://extensions</code> and find the extension folder on disk (or locate it under your Chrome profile's Extensions directory).</li>
+<li>Copy the extension's folder to your machine. Look for <code>manifest.json</code> and files listed under <code>content_scripts</code>.</li>
+<li>Find the JS files listed under content_scripts. Those files are the scripts you can try to run as user-scripts in schnopdih.</li>
+<li>In schnopdih: Settings → Extensions → Install Script -> choose the JS file.</li>
+<li>If the script references <code>chrome.*</code> APIs, you'll need to port or remove those calls.</li>
+</ol>
+<p>If you want, paste the extension ID or path and I can help extract/adapt content scripts for you.</p>
+</body>
+</html>
+"""
+
 # -------------------------
 # Persistence helpers
 # -------------------------
 
-def _load_json(path: Path, default):
+def _json_dumps(data, indent: bool = False) -> bytes:
+    # orjson encodes straight to bytes in C; stdlib json is the fallback
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE if indent else 0
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _zst_path(path: Path) -> Path:
+    return path.with_name(path.name + ".zst")
+
+
+_zst_warned = set()
+
+
+def _load_json(path: Path, default, compress: bool = False):
     try:
+        zpath = _zst_path(path)
+        if compress and zpath.exists():
+            if zstd is None:
+                # compressed copy from a run that had zstandard; say so once instead of silently
+                # starting over (saves fall back to plaintext, and the newer file wins later)
+                if str(zpath) not in _zst_warned:
+                    _zst_warned.add(str(zpath))
+                    print(f"{APP_NAME}: zstandard is not installed, can't read {zpath}", file=sys.stderr)
+            # either copy can be the current one (zstandard missing for a while); take the newer
+            elif not path.exists() or zpath.stat().st_mtime >= path.stat().st_mtime:
+                return _json_loads(zstd.ZstdDecompressor().decompress(zpath.read_bytes()))
         if path.exists():
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            return _json_loads(path.read_bytes())
     except Exception:
         pass
     return default
 
 
-def _save_json(path: Path, data):
+_saved_digests: Dict[str, bytes] = {}
+
+
+def _write_atomic(path: Path, raw: bytes, encode=None):
+    # skip the write when the serialized payload is what we last put there
+    digest = hashlib.blake2b(raw, digest_size=8).digest()
+    key = str(path)
+    if _saved_digests.get(key) == digest and path.exists():
+        return
+    if encode is not None:
+        raw = encode(raw)
+    # write next to the target and swap it in, so a crash never leaves a truncated file
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(raw)
+    os.replace(tmp, path)
+    _saved_digests[key] = digest
+
+
+def _save_json(path: Path, data, compress: bool = False, pretty: bool = False):
+    # internal state is written compact; pretty is for files people edit by hand (extension manifests)
     try:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        if compress and zstd is not None:
+            _write_atomic(_zst_path(path), _json_dumps(data), zstd.ZstdCompressor(level=3).compress)
+            # drop the plaintext copy once it's been migrated
+            if path.exists():
+                path.unlink()
+            return
+        _write_atomic(path, _json_dumps(data, indent=pretty))
     except Exception:
         pass
 
 
+_last_ts = (0, "")
+
+
 def _now_iso() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+    # second precision is plenty for bookmark/history stamps; reuse the string within a second
+    global _last_ts
+    t = int(time.time())
+    if t != _last_ts[0]:
+        _last_ts = (t, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t)))
+    return _last_ts[1]
+
+# -------------------------
+# Background work
+# -------------------------
+class _Task(QRunnable):
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            self.fn(*self.args, **self.kwargs)
+        except Exception:
+            pass
+
+
+# single worker so background file writes land in the order they were queued
+_background_pool = QThreadPool()
+_background_pool.setMaxThreadCount(1)
+
+
+def run_in_background(fn, *args, **kwargs):
+    # fire-and-forget; fn must not touch widgets
+    _background_pool.start(_Task(fn, *args, **kwargs))
+
+
+def wait_for_background():
+    _background_pool.waitForDone()
+
+
+def _scandir_rm(path: str):
+    # one scandir per directory; DirEntry's cached type info means no extra stat per child.
+    # errors are swallowed per entry, like rmtree(ignore_errors=True)
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        _scandir_rm(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                except Exception:
+                    pass
+        os.rmdir(path)
+    except Exception:
+        pass
+
+
+def _fast_rm(path: Path):
+    # chromium caches are hundreds of thousands of tiny files; the native tools beat rmtree there
+    try:
+        if sys.platform.startswith("win"):
+            subprocess.run(["cmd", "/c", "rd", "/s", "/q", str(path)],
+                           creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            subprocess.run(["rm", "-rf", str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except Exception:
+        pass
+    # binary missing or it gave up part way
+    if path.exists():
+        p = str(path.resolve())
+        if sys.platform.startswith("win") and len(p) > 240 and not p.startswith("\\\\?\\"):
+            p = "\\\\?\\" + p
+        _scandir_rm(p)
 
 # -------------------------
 # Simple toast for non-blocking messages (light style)
@@ -160,13 +362,48 @@ class Toast(QWidget):
 def show_toast(window: QWidget, text: str):
     Toast(window, text)
 
+
+def apply_stylesheet(widget: QWidget, css: str):
+    # Qt reparses the whole sheet on every setStyleSheet; skip when it's already applied
+    h = hash(css)
+    if widget.property("stylehash") == h:
+        return
+    widget.setStyleSheet(css)
+    widget.setProperty("stylehash", h)
+
 # -------------------------
 # Managers
 # -------------------------
+def _lower_fields(entry: Dict) -> Tuple[str, str]:
+    return (entry.get("title") or "").lower(), (entry.get("url") or "").lower()
+
+
 class BookmarkManager:
     def __init__(self, path: Path = BOOKMARKS_FILE):
         self.path = path
         self.bookmarks: List[Dict] = _load_json(self.path, []) or []
+        # url -> number of entries with that url, so exists()/dedupe/remove don't scan the list.
+        # a count rather than one entry: an edit can point a bookmark at a url that's already saved
+        self._url_counts: Dict[str, int] = {}
+        for b in self.bookmarks:
+            self._count_url(b.get("url"), 1)
+        # lowercased titles/urls as two flat lists parallel to self.bookmarks, so search() scores
+        # plain strings; kept out of the entries themselves so they never reach the json file
+        self._titles_lc: List[str] = []
+        self._urls_lc: List[str] = []
+        self._reindex()
+
+    def _count_url(self, url: str, delta: int):
+        n = self._url_counts.get(url, 0) + delta
+        if n > 0:
+            self._url_counts[url] = n
+        else:
+            self._url_counts.pop(url, None)
+
+    def _reindex(self):
+        pairs = [_lower_fields(b) for b in self.bookmarks]
+        self._titles_lc = [t for t, u in pairs]
+        self._urls_lc = [u for t, u in pairs]
 
     def add(self, title: str, url: str):
         if not url:
@@ -174,23 +411,36 @@ class BookmarkManager:
         if not urlparse(url).scheme:
             if "." in url and " " not in url:
                 url = "http://" + url
-        if any(b.get("url") == url for b in self.bookmarks):
+        if url in self._url_counts:
             return
         entry = {"title": title or url, "url": url, "created": _now_iso()}
         self.bookmarks.insert(0, entry)
+        t, u = _lower_fields(entry)
+        self._titles_lc.insert(0, t)
+        self._urls_lc.insert(0, u)
+        self._count_url(url, 1)
         _save_json(self.path, self.bookmarks)
 
     def remove(self, url: str):
-        self.bookmarks = [b for b in self.bookmarks if b.get("url") != url]
+        if self._url_counts.pop(url, None) is None:
+            return
+        keep = [i for i, b in enumerate(self.bookmarks) if b.get("url") != url]
+        self.bookmarks = [self.bookmarks[i] for i in keep]
+        self._titles_lc = [self._titles_lc[i] for i in keep]
+        self._urls_lc = [self._urls_lc[i] for i in keep]
         _save_json(self.path, self.bookmarks)
 
     def update(self, old_url: str, new_title: str, new_url: str):
-        for b in self.bookmarks:
-            if b.get("url") == old_url:
-                b["title"] = new_title or new_url
-                b["url"] = new_url
-                b["updated"] = _now_iso()
-                break
+        if old_url not in self._url_counts:
+            return
+        # edits are rare; the first entry with the url is the one edited, as before the index
+        i, b = next((i, b) for i, b in enumerate(self.bookmarks) if b.get("url") == old_url)
+        b["title"] = new_title or new_url
+        b["url"] = new_url
+        b["updated"] = _now_iso()
+        self._titles_lc[i], self._urls_lc[i] = _lower_fields(b)
+        self._count_url(old_url, -1)
+        self._count_url(new_url, 1)
         _save_json(self.path, self.bookmarks)
 
     def all(self) -> List[Dict]:
@@ -199,53 +449,125 @@ class BookmarkManager:
     def exists(self, url: str) -> bool:
         if not url:
             return False
-        return any(b.get("url") == url for b in self.bookmarks)
+        return url in self._url_counts
 
     def search(self, q: str, limit: int = 12) -> List[Dict]:
         ql = (q or "").lower()
         if not ql:
             return self.bookmarks[:limit]
-        scored = []
-        for b in self.bookmarks:
-            t = (b.get("title") or "").lower()
-            u = (b.get("url") or "").lower()
-            score = (ql in t) * 2 + (ql in u)
-            if score:
-                scored.append((score, b))
-        scored.sort(key=lambda x: -x[0])
-        return [b for s, b in scored][:limit]
+        scores = [(ql in t) * 2 + (ql in u) for t, u in zip(self._titles_lc, self._urls_lc)]
+        hits = [i for i, score in enumerate(scores) if score]
+        # top-k only; nlargest keeps insertion order for ties like the old stable sort
+        return [self.bookmarks[i] for i in heapq.nlargest(limit, hits, key=scores.__getitem__)]
+
+
+def _history_rows(rows) -> List[Dict]:
+    return [{"title": t, "url": u, "time": ts} for t, u, ts in rows]
+
+
+def _save_history(path: Path, rows):
+    # rows are (title, url, time) tuples; build the json records here, off the GUI thread
+    _save_json(path, _history_rows(rows), compress=True)
 
 
 class HistoryManager:
     def __init__(self, path: Path = HISTORY_FILE):
         self.path = path
-        self.history: List[Dict] = _load_json(self.path, []) or []
+        # one column per field instead of a dict per entry, newest first; index p is the same entry
+        # in every column. Entries are only materialized as dicts on the way out (search, __getitem__)
+        self.titles: Deque[str] = deque(maxlen=HISTORY_LIMIT)
+        self.urls: Deque[str] = deque(maxlen=HISTORY_LIMIT)
+        self.times: Deque[str] = deque(maxlen=HISTORY_LIMIT)
+        for h in islice(_load_json(self.path, [], compress=True) or [], HISTORY_LIMIT):
+            url = h.get("url") or ""
+            self.titles.append(h.get("title") or url)
+            self.urls.append(url)
+            self.times.append(h.get("time") or "")
+        # lowercased columns kept in step with the above so search() never calls lower()
+        self._titles_lc: Deque[str] = deque((t.lower() for t in self.titles), maxlen=HISTORY_LIMIT)
+        self._urls_lc: Deque[str] = deque((u.lower() for u in self.urls), maxlen=HISTORY_LIMIT)
+        # called with no args after each new entry (open history windows refresh through this)
+        self.listeners: List = []
+        # called with no args when the newest entry is refreshed in place (repeat visit, new title)
+        self.head_listeners: List = []
+        # add() only marks the history dirty; the timer writes it at most every 2s, off the GUI thread
+        self._dirty = False
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(2000)
+        self._flush_timer.setTimerType(Qt.CoarseTimer)
+        self._flush_timer.timeout.connect(self._flush)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_now)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __getitem__(self, p: int) -> Dict:
+        return {"title": self.titles[p], "url": self.urls[p], "time": self.times[p]}
 
     def add(self, title: str, url: str):
-        entry = {"title": title or url, "url": url, "time": _now_iso()}
-        self.history.insert(0, entry)
-        self.history = self.history[:5000]
-        _save_json(self.path, self.history)
+        # reloads and repeat loads of the newest entry only refresh it instead of stacking duplicates
+        if self.urls and self.urls[0] == url:
+            self._touch_head(title or url)
+            return
+        title = title or url
+        self.titles.appendleft(title)
+        self.urls.appendleft(url)
+        self.times.appendleft(_now_iso())
+        self._titles_lc.appendleft(title.lower())
+        self._urls_lc.appendleft(url.lower())
+        self._mark_dirty()
+        for fn in list(self.listeners):
+            try:
+                fn()
+            except Exception:
+                pass
+
+    def _touch_head(self, title: str):
+        self.times[0] = _now_iso()
+        if self.titles[0] != title:
+            self.titles[0] = title
+            self._titles_lc[0] = title.lower()
+        self._mark_dirty()
+        for fn in list(self.head_listeners):
+            try:
+                fn()
+            except Exception:
+                pass
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        run_in_background(_save_history, self.path, list(zip(self.titles, self.urls, self.times)))
+
+    def flush_now(self):
+        self._flush_timer.stop()
+        wait_for_background()
+        if self._dirty:
+            self._dirty = False
+            _save_history(self.path, zip(self.titles, self.urls, self.times))
 
     def search(self, q: str, limit: int = 12) -> List[Dict]:
         ql = (q or "").lower()
         if not ql:
-            return self.history[:limit]
+            return _history_rows(islice(zip(self.titles, self.urls, self.times), limit))
         res = []
         # scan in LIFO order but stop early for perf
-        scanned = 0
         max_scan = 3000  # don't scan more than 3k entries for responsiveness
-        for h in self.history:
-            if scanned >= max_scan:
-                break
-            scanned += 1
-            t = (h.get("title") or "").lower()
-            u = (h.get("url") or "").lower()
+        for p, (t, u) in enumerate(islice(zip(self._titles_lc, self._urls_lc), max_scan)):
             if ql in t or ql in u:
-                res.append(h)
+                res.append(self[p])
                 if len(res) >= limit:
                     break
-        return res[:limit]
+        return res
 
 
 class SessionManager:
@@ -253,10 +575,10 @@ class SessionManager:
         self.path = path
 
     def save(self, tabs: List[str]):
-        _save_json(self.path, {"tabs": tabs, "saved": _now_iso()})
+        _save_json(self.path, {"tabs": tabs, "saved": _now_iso()}, compress=True)
 
     def restore(self) -> List[str]:
-        data = _load_json(self.path, None)
+        data = _load_json(self.path, None, compress=True)
         if not data:
             return []
         return data.get("tabs", [])
@@ -281,11 +603,11 @@ class DownloadManager:
             item.setPath(dest)
             item.accept()
             try:
-                item.finished.connect(lambda: self._finish(dr))
+                item.finished.connect(partial(self._finish, dr))
             except Exception:
                 pass
             try:
-                item.downloadProgress.connect(lambda received, total: self._progress(dr, received, total))
+                item.downloadProgress.connect(partial(self._progress, dr))
             except Exception:
                 pass
         except Exception:
@@ -321,20 +643,74 @@ class SimpleRequestInterceptor(QWebEngineUrlRequestInterceptor):
             "facebook.com/tr",
             "amazon-adsystem",
         ]
+        # runs for every subresource request: with pyahocorasick all patterns are matched in one pass
+        self._automaton = None
+        if ahocorasick is not None and self.blocklist:
+            try:
+                automaton = ahocorasick.Automaton()
+                for pat in self.blocklist:
+                    automaton.add_word(pat, pat)
+                automaton.make_automaton()
+                self._automaton = automaton
+            except Exception:
+                self._automaton = None
+        # otherwise one alternation regex (google-re2's linear-time DFA if installed) instead of a pattern loop
+        self._regex = None
+        if self._automaton is None and self.blocklist:
+            try:
+                self._regex = (re2 or re).compile("|".join(re.escape(p) for p in self.blocklist))
+            except Exception:
+                self._regex = None
+        # pages re-request the same subresource urls (reloads, shared css/js); remember verdicts
+        self._blocked = lru_cache(maxsize=4096)(self._matches)
+
+    def _matches(self, url: str) -> bool:
+        if self._automaton is not None:
+            return next(self._automaton.iter(url), None) is not None
+        if self._regex is not None:
+            return self._regex.search(url) is not None
+        for pat in self.blocklist:
+            if pat in url:
+                return True
+        return False
 
     def interceptRequest(self, info):
         try:
             url = info.requestUrl().toString().lower()
-            for pat in self.blocklist:
-                if pat in url:
-                    info.block(True)
-                    return
+            if self._blocked(url):
+                info.block(True)
         except Exception:
             pass
 
 # -------------------------
 # WebView
 # -------------------------
+def _is_chrome_store_url(url: str) -> bool:
+    lower = url.lower()
+    return 'chrome.google.com/webstore' in lower or lower.startswith('chrome://')
+
+
+class SchnopdihPage(QWebEnginePage):
+    # Chrome Web Store / chrome:// can't work here; refuse the navigation before anything is fetched
+    chromeStoreRequested = pyqtSignal(QUrl)
+
+    def acceptNavigationRequest(self, url, nav_type, is_main_frame):
+        if is_main_frame and _is_chrome_store_url(url.toString()):
+            self.chromeStoreRequested.emit(url)
+            return False
+        return super().acceptNavigationRequest(url, nav_type, is_main_frame)
+
+
+@lru_cache(maxsize=8)
+def _build_css_js(css: str) -> str:
+    safe_css = css.replace("`", "\\`")
+    return ("(function(){var id='__schnopdih_css';var s=document.getElementById(id);if(!s){s=document.createElement('style');s.id=id;document.head.appendChild(s);}s.textContent = `" + safe_css + "`;})();")
+
+
+# default theme is what almost every tab uses; build its script once at import
+_build_css_js(PLAIN_WHITE_CSS)
+
+
 class SchnopdihWebView(QWebEngineView):
     titleChanged = pyqtSignal(str)
 
@@ -342,7 +718,7 @@ class SchnopdihWebView(QWebEngineView):
         super().__init__()
         if profile is not None:
             try:
-                self.setPage(QWebEnginePage(profile, self))
+                self.setPage(SchnopdihPage(profile, self))
             except Exception:
                 pass
         try:
@@ -354,14 +730,27 @@ class SchnopdihWebView(QWebEngineView):
         except Exception:
             pass
         self._theme_css = theme_css
-        if theme_css:
-            QTimer.singleShot(300, lambda: self.inject_css(theme_css))
+        self._last_find = ""
+        self.loadStarted.connect(self._on_load_started)
+        self.loadFinished.connect(self._inject_theme)
+
+    def _on_load_started(self):
+        # injected <style> and find highlights go away with the document
+        self.page().setProperty("stylehash", None)
+        self._last_find = ""
+
+    def _inject_theme(self, ok: bool):
+        if ok and self._theme_css:
+            self.inject_css(self._theme_css)
 
     def inject_css(self, css: str):
+        self._theme_css = css
         try:
-            safe_css = css.replace("`", "\`")
-            js = ("(function(){var id='__schnopdih_css';var s=document.getElementById(id);if(!s){s=document.createElement('style');s.id=id;document.head.appendChild(s);}s.textContent = `" + safe_css + "`;})();")
-            self.page().runJavaScript(js)
+            h = hash(css)
+            if self.page().property("stylehash") == h:
+                return
+            self.page().runJavaScript(_build_css_js(css))
+            self.page().setProperty("stylehash", h)
         except Exception:
             pass
 
@@ -376,18 +765,23 @@ class SchnopdihWebView(QWebEngineView):
             pass
 
     def find_text(self, text: str):
-        if not text:
+        text = text.strip()
+        # same query on the same document is already highlighted; a new query replaces the old
+        # highlights by itself, so no findText("") round trip first
+        if not text or text == self._last_find:
             return
         try:
-            self.findText("")
             self.findText(text, QWebEnginePage.FindFlags())
+            self._last_find = text
         except Exception:
             pass
 
     def take_screenshot(self, path: Path) -> bool:
         try:
-            pixmap = self.grab()
-            pixmap.save(str(path))
+            # grab on the GUI thread (cheap); QImage is safe to encode elsewhere, so deflate off-thread.
+            # PNG quality 90 maps to light zlib compression: bigger file, much faster encode
+            image = self.grab().toImage()
+            run_in_background(image.save, str(path), "PNG", 90)
             return True
         except Exception:
             return False
@@ -478,6 +872,48 @@ class TitleBar(QWidget):
     def setTitle(self, text: str):
         self.title.setText(text)
 
+# -------------------------
+# Lazy list model for title/url entries (history, reading list)
+# -------------------------
+class UrlListModel(QAbstractListModel):
+    # rows are formatted on demand, so only the visible ones ever cost anything.
+    # entries may be a live sequence (the HistoryManager itself); call entry_prepended() after it grows
+    def __init__(self, entries, parent=None):
+        super().__init__(parent)
+        self.entries = entries
+        self._rows = len(entries)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._rows
+
+    def entry_prepended(self):
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._rows += 1
+        self.endInsertRows()
+        # a bounded deque drops its oldest entry to make room
+        n = len(self.entries)
+        if self._rows > n:
+            self.beginRemoveRows(QModelIndex(), n, self._rows - 1)
+            self._rows = n
+            self.endRemoveRows()
+
+    def head_changed(self):
+        if self._rows:
+            top = self.index(0)
+            self.dataChanged.emit(top, top)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.entries):
+            return None
+        e = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{e.get('title')} — {e.get('url')}"
+        if role == Qt.UserRole:
+            return e.get('url')
+        return None
+
 # -------------------------
 # Bookmarks Dialog (add/remove/edit)
 # -------------------------
@@ -534,11 +970,18 @@ class BookmarksDialog(QDialog):
         menu.exec_(self.list.mapToGlobal(pos))
 
     def _refresh(self):
-        self.list.clear()
-        for b in self.parent_window.bookmarks.all():
-            it = QListWidgetItem(f"{b.get('title')} — {b.get('url')}")
-            it.setData(Qt.UserRole, b.get('url'))
-            self.list.addItem(it)
+        # rebuild with updates/signals off so Qt relayouts once instead of per row
+        self.list.setUpdatesEnabled(False)
+        self.list.blockSignals(True)
+        try:
+            self.list.clear()
+            for b in self.parent_window.bookmarks.all():
+                it = QListWidgetItem(f"{b.get('title')} — {b.get('url')}")
+                it.setData(Qt.UserRole, b.get('url'))
+                self.list.addItem(it)
+        finally:
+            self.list.blockSignals(False)
+            self.list.setUpdatesEnabled(True)
 
     def _open_item(self, it: QListWidgetItem):
         url = it.data(Qt.UserRole)
@@ -646,18 +1089,23 @@ class SchnopdihWindow(QMainWindow):
         self.history = HistoryManager()
         self.downloads = DownloadManager()
         self.session = SessionManager()
-        self.closed_tabs_stack: List[str] = []
+        self.closed_tabs_stack: Deque[str] = deque(maxlen=20)
+        # 5% bucket last written to the (single, shared) status label; -1 when something else wrote it
+        self._last_progress_bucket = -1
         self.current_theme_css = PLAIN_WHITE_CSS
 
         # keep references to any open dialogs so they don't vanish
         self._open_dialogs: List[QWidget] = []
+        # built on first open and reused, so start-up and repeat opens don't rebuild its three tabs
+        self._settings_dialog: Optional[QDialog] = None
 
         # profile
         self.profile = QWebEngineProfile.defaultProfile()
         try:
             self.profile.setCachePath(str(CACHE_DIR))
             self.profile.setPersistentStoragePath(str(STORAGE_DIR))
-            self.profile.setHttpCacheMaximumSize(300 * 1024 * 1024)
+            self.profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+            self.profile.setHttpCacheMaximumSize(HTTP_CACHE_MAX_BYTES)
             try:
                 self.profile.setHttpUserAgent(MODERN_USER_AGENT)
             except Exception:
@@ -674,18 +1122,44 @@ class SchnopdihWindow(QMainWindow):
         except Exception:
             pass
 
+        # off-the-record profile shared by every private tab, created on first use
+        self._private_profile: Optional[QWebEngineProfile] = None
+
+        # session autosave: tab changes only mark it dirty, the timer writes at most once per 2s
+        self._session_dirty = False
+        self._session_restored = False
+        self._session_timer = QTimer(self)
+        self._session_timer.setSingleShot(True)
+        self._session_timer.setInterval(2000)
+        self._session_timer.setTimerType(Qt.CoarseTimer)
+        self._session_timer.timeout.connect(self._flush_session)
+        QApplication.instance().aboutToQuit.connect(self._flush_session)
+
+        # coalescing timers: restarting a pending single-shot folds bursts into one call
+        self._star_timer = QTimer(self)
+        self._star_timer.setSingleShot(True)
+        self._star_timer.setInterval(30)
+        self._star_timer.setTimerType(Qt.CoarseTimer)
+        self._star_timer.timeout.connect(self._update_star_button)
+        self._bookmarks_bar_timer = QTimer(self)
+        self._bookmarks_bar_timer.setSingleShot(True)
+        self._bookmarks_bar_timer.setInterval(200)
+        self._bookmarks_bar_timer.setTimerType(Qt.CoarseTimer)
+        self._bookmarks_bar_timer.timeout.connect(self.refresh_bookmarks_toolbar)
+
         # UI
         self._build_ui()
         self._connect_signals()
 
         # debounce timer for omnibox suggestions — prevents UI freeze on large histories
+        # every keystroke restarts it, so a typing burst ends in a single search
         self.omnibox_timer = QTimer(self)
-        self.omnibox_timer.setInterval(220)
+        self.omnibox_timer.setInterval(150)
         self.omnibox_timer.setSingleShot(True)
         self.omnibox_timer.timeout.connect(self._populate_suggestions)
-        self._pending_omnibox_text = ""
 
-        QTimer.singleShot(250, self._restore_session)
+        # the first web view is what spins Chromium up; let the window paint before paying for it
+        QTimer.singleShot(0, self._open_initial_tabs)
         self._apply_app_palette()
 
         self._fade_anim = QPropertyAnimation(self, b"windowOpacity")
@@ -697,15 +1171,9 @@ class SchnopdihWindow(QMainWindow):
         self._fade_anim.start()
 
         # load extension-like JS files
+        self._extensions_cache: Optional[List[Dict]] = None
         self._load_enabled_extensions()
 
-    # small helper used widely to avoid repetitive try/except
-    def _safe_call(self, fn):
-        try:
-            return fn()
-        except Exception:
-            return None
-
     def _track_dialog(self, dlg: QWidget):
         # keep a strong reference so Python GC doesn't close the widget
         try:
@@ -774,7 +1242,7 @@ class SchnopdihWindow(QMainWindow):
 
         self.btn_newtab_corner = QPushButton("+")
         self.btn_newtab_corner.setFixedSize(26, 26)
-        self.btn_newtab_corner.clicked.connect(lambda: self.add_tab(DEFAULT_HOMEPAGE, switch=True))
+        self.btn_newtab_corner.clicked.connect(self._new_tab, Qt.UniqueConnection)
         self.tabs.setCornerWidget(self.btn_newtab_corner, corner=Qt.TopRightCorner)
 
         root_layout.addWidget(self.tabs)
@@ -796,9 +1264,13 @@ class SchnopdihWindow(QMainWindow):
         self.suggestion_list.setFocusPolicy(Qt.NoFocus)
         self.suggestion_list.setMouseTracking(True)
         self.suggestion_list.itemClicked.connect(self._on_suggestion_clicked)
-
-        # initial tab
-        self.add_tab(DEFAULT_HOMEPAGE, switch=True)
+        # fixed pool of rows reused on every keystroke
+        self._suggestion_pool: List[QListWidgetItem] = []
+        for _ in range(OMNIBOX_SUGGESTIONS):
+            it = QListWidgetItem()
+            self.suggestion_list.addItem(it)
+            it.setHidden(True)
+            self._suggestion_pool.append(it)
 
     def refresh_bookmarks_toolbar(self):
         try:
@@ -814,10 +1286,10 @@ class SchnopdihWindow(QMainWindow):
                 btn = QPushButton(title)
                 btn.setStyleSheet('background:#fff;border:1px solid #e6e6e6;padding:4px 8px;border-radius:6px;color:#000;')
                 btn.setFixedHeight(26)
-                btn.clicked.connect(lambda checked, url=b.get('url'): self.add_tab(url, switch=True))
+                btn.clicked.connect(partial(self._open_url_tab, b.get('url')))
                 # custom context menu on each button
                 btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                btn.customContextMenuRequested.connect(lambda pos, url=b.get('url'), btn=btn: self._bookmark_button_context_menu(url, btn))
+                btn.customContextMenuRequested.connect(partial(self._bookmark_button_context_menu, b.get('url'), btn))
                 layout.addWidget(btn)
             # spacer and add current button
             spacer = QWidget()
@@ -831,7 +1303,14 @@ class SchnopdihWindow(QMainWindow):
         except Exception:
             pass
 
-    def _bookmark_button_context_menu(self, url: str, btn: QWidget):
+    def _open_url_tab(self, url: str, *_):
+        # signal args (clicked's checked flag) are ignored
+        self.add_tab(url, switch=True)
+
+    def _open_index_tab(self, index: QModelIndex):
+        self.add_tab(index.data(Qt.UserRole), switch=True)
+
+    def _bookmark_button_context_menu(self, url: str, btn: QWidget, pos=None):
         menu = QMenu(self)
         menu.addAction("Open", lambda: self.add_tab(url, switch=True))
         menu.addAction("Edit", lambda: self._edit_bookmark_dialog(url))
@@ -872,57 +1351,96 @@ class SchnopdihWindow(QMainWindow):
                 self.refresh_bookmarks_toolbar()
 
     def _connect_signals(self):
-        self.act_back.triggered.connect(lambda: self._safe_call(lambda: self._current_view().back()))
-        self.act_forward.triggered.connect(lambda: self._safe_call(lambda: self._current_view().forward()))
-        self.act_reload.triggered.connect(lambda: self._safe_call(lambda: self._current_view().reload()))
-        self.act_home.triggered.connect(lambda: self._safe_call(lambda: self._current_view().load(QUrl(DEFAULT_HOMEPAGE))))
-
-        self.urlbar.returnPressed.connect(self._on_omnibox_go)
-        self.urlbar.textEdited.connect(self._on_omnibox_edit)
+        # slots below are real Qt slots (pyqtSlot), so connects are typed and can be made unique
+        self.act_back.triggered.connect(self._go_back, Qt.UniqueConnection)
+        self.act_forward.triggered.connect(self._go_forward, Qt.UniqueConnection)
+        self.act_reload.triggered.connect(self._reload_current, Qt.UniqueConnection)
+        self.act_home.triggered.connect(self._load_home, Qt.UniqueConnection)
+
+        self.urlbar.returnPressed.connect(self._on_omnibox_go, Qt.UniqueConnection)
+        self.urlbar.textEdited.connect(self._on_omnibox_edit, Qt.UniqueConnection)
         self._orig_urlbar_keypress = self.urlbar.keyPressEvent
         self.urlbar.keyPressEvent = self._urlbar_keypress_override
 
-        self.btn_menu.clicked.connect(self._open_menu)
+        self.btn_menu.clicked.connect(self._open_menu, Qt.UniqueConnection)
 
         try:
             self.profile.downloadRequested.connect(self._on_download_requested)
         except Exception:
             pass
 
-        QShortcut(QKeySequence("Ctrl+T"), self, activated=lambda: self.add_tab(DEFAULT_HOMEPAGE, switch=True))
-        QShortcut(QKeySequence("Ctrl+W"), self, activated=lambda: self._safe_call(lambda: self._close_tab(self.tabs.currentIndex())))
-        QShortcut(QKeySequence("Ctrl+L"), self, activated=lambda: self._safe_call(lambda: self.urlbar.setFocus()))
+        QShortcut(QKeySequence("Ctrl+T"), self, activated=self._new_tab)
+        QShortcut(QKeySequence("Ctrl+W"), self, activated=self._close_current_tab)
+        QShortcut(QKeySequence("Ctrl+L"), self, activated=self._focus_urlbar)
         QShortcut(QKeySequence("F11"), self, activated=self._toggle_fullscreen)
         QShortcut(QKeySequence("Ctrl+Shift+T"), self, activated=self._reopen_closed_tab)
-        QShortcut(QKeySequence("Ctrl+R"), self, activated=lambda: self._safe_call(lambda: self._current_view().reload()))
+        QShortcut(QKeySequence("Ctrl+R"), self, activated=self._reload_current)
         QShortcut(QKeySequence("Ctrl+Tab"), self, activated=self._next_tab)
         QShortcut(QKeySequence("Ctrl+Shift+Tab"), self, activated=self._prev_tab)
 
+    # action/shortcut slots — bound methods so signals don't go through a lambda per emit
+    @pyqtSlot()
+    def _go_back(self):
+        v = self._current_view()
+        if v:
+            v.back()
+
+    @pyqtSlot()
+    def _go_forward(self):
+        v = self._current_view()
+        if v:
+            v.forward()
+
+    @pyqtSlot()
+    def _reload_current(self):
+        v = self._current_view()
+        if v:
+            v.reload()
+
+    @pyqtSlot()
+    def _load_home(self):
+        v = self._current_view()
+        if v:
+            v.load(QUrl(DEFAULT_HOMEPAGE))
+
+    @pyqtSlot()
+    def _new_tab(self):
+        self.add_tab(DEFAULT_HOMEPAGE, switch=True)
+
+    @pyqtSlot()
+    def _new_private_tab(self):
+        self.add_tab(DEFAULT_HOMEPAGE, switch=True, private=True)
+
+    @pyqtSlot()
+    def _close_current_tab(self):
+        self._close_tab(self.tabs.currentIndex())
+
+    @pyqtSlot()
+    def _focus_urlbar(self):
+        self.urlbar.setFocus()
+
+    @pyqtSlot()
+    def _show_settings(self):
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(self)
+        else:
+            self._settings_dialog.reload()
+        self._settings_dialog.exec_()
+
+    @pyqtSlot()
     def _open_menu(self):
         menu = QMenu()
-        menu.addAction("New Tab", lambda: self.add_tab(DEFAULT_HOMEPAGE, switch=True))
-        menu.addAction("New Private Tab", lambda: self.add_tab(DEFAULT_HOMEPAGE, switch=True, private=True))
-        menu.addAction("Settings", lambda: SettingsDialog(self).exec_())
-        menu.addAction("Bookmarks", lambda: self._show_bookmarks())
-        menu.addAction("History", lambda: self._show_history())
-        menu.addAction("Downloads", lambda: self._show_downloads())
+        menu.addAction("New Tab", self._new_tab)
+        menu.addAction("New Private Tab", self._new_private_tab)
+        menu.addAction("Settings", self._show_settings)
+        menu.addAction("Bookmarks", self._show_bookmarks)
+        menu.addAction("History", self._show_history)
+        menu.addAction("Downloads", self._show_downloads)
         menu.exec_(self.btn_menu.mapToGlobal(self.btn_menu.rect().bottomLeft()))
 
     def add_tab(self, url: str = DEFAULT_HOMEPAGE, switch: bool = False, private: bool = False):
         if private:
-            profile = QWebEngineProfile()
-            try:
-                profile.setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies)
-                tmp_cache = tempfile.mkdtemp(prefix="schnopdih_tmp_cache_")
-                profile.setCachePath(tmp_cache)
-                profile.setPersistentStoragePath("")
-                try:
-                    profile.setHttpUserAgent(MODERN_USER_AGENT)
-                except Exception:
-                    pass
-            except Exception:
-                pass
-            view = SchnopdihWebView(profile=profile, theme_css=self.current_theme_css)
+            view = SchnopdihWebView(profile=self._get_private_profile(), theme_css=self.current_theme_css)
         else:
             view = SchnopdihWebView(profile=self.profile, theme_css=self.current_theme_css)
 
@@ -930,21 +1448,24 @@ class SchnopdihWindow(QMainWindow):
         if switch:
             self.tabs.setCurrentIndex(idx)
         # connect signals
-        view.titleChanged.connect(lambda t, v=view: self._update_tab_title(v, t))
-        view.urlChanged.connect(lambda u, v=view: self._update_urlbar(v, u))
-        view.urlChanged.connect(lambda u, v=view: self._on_view_url_changed(v, u))
-        view.loadFinished.connect(lambda ok, v=view: self._on_load_finished(ok, v))
+        view.titleChanged.connect(partial(self._update_tab_title, view))
+        view.urlChanged.connect(partial(self._update_urlbar, view))
+        view.urlChanged.connect(partial(self._on_view_url_changed, view))
+        if isinstance(view.page(), SchnopdihPage):
+            # queued: don't replace the page content from inside acceptNavigationRequest
+            view.page().chromeStoreRequested.connect(partial(self._show_chrome_store_help, view), Qt.QueuedConnection)
+        view.loadFinished.connect(partial(self._on_load_finished, view))
         try:
-            view.loadProgress.connect(lambda p, v=view: self._on_load_progress(p, v))
+            view.loadProgress.connect(partial(self._on_load_progress, view))
         except Exception:
             pass
         view.setZoomFactor(1.0)
-        view.loadFinished.connect(lambda ok, v=view: self._inject_extensions_into_view(v))
         if url:
             try:
                 view.load(QUrl(url))
             except Exception:
                 pass
+        self._mark_session_dirty()
         return view
 
     def _current_view(self) -> Optional[SchnopdihWebView]:
@@ -953,47 +1474,25 @@ class SchnopdihWindow(QMainWindow):
             return w
         return None
 
+    def _show_chrome_store_help(self, view: SchnopdihWebView, qurl: Optional[QUrl] = None):
+        view.setHtml(CHROME_WEBSTORE_HELP_HTML, QUrl('about:blank'))
+        show_toast(self, 'Chrome Web Store is not supported directly — opened help')
+
     def _on_view_url_changed(self, view: SchnopdihWebView, qurl: QUrl):
+        # normally stopped by SchnopdihPage before loading; this catches anything that slips through
         try:
-            url = qurl.toString()
-            lower = url.lower()
-            if 'chrome.google.com/webstore' in lower or lower.startswith('chrome://') or 'chrome://extensions' in lower:
-                help_html = self._chrome_webstore_help_html()
-                view.setHtml(help_html, QUrl('about:blank'))
-                show_toast(self, 'Chrome Web Store is not supported directly — opened help')
+            if _is_chrome_store_url(qurl.toString()):
+                self._show_chrome_store_help(view)
                 return
         except Exception:
             pass
         # update star state on URL change
-        QTimer.singleShot(50, self._update_star_button)
-
-    def _chrome_webstore_help_html(self):
-        return """
-<!doctype html>
-<html>
-<head><meta charset='utf-8'><title>Chrome Web Store — Not Supported</title></head>
-<body style='font-family:Segoe UI,Arial; padding:20px; background:#fff; color:#000'>
-<h2>Chrome Web Store is not supported directly in this app</h2>
-<p>QtWebEngine does not provide the Chromium Extensions APIs required to install and run Chrome Web Store extensions.</p>
-<h3>Two practical alternatives</h3>
-<ul>
-<li><strong>Install unpacked content scripts</strong>: If an extension only injects content scripts (JS that manipulates pages), you can extract those files from the extension and install them as a schnopdih "script": <em>Settings → Extensions → Install Script</em>.</li>
-<li><strong>Use a Chromium-based browser</strong> (Chrome, Edge) for extensions that need full extension APIs (background pages, chrome.runtime, webRequest, etc.).</li>
-</ul>
-<h3>Quick extract guide</h3>
-<ol>
-<li>In Chrome, enable Developer Mode on <code>chrome://extensions</code> and find the extension folder on disk (or locate it under your Chrome profile's Extensions directory).</li>
-<li>Copy the extension's folder to your machine. Look for <code>manifest.json</code> and files listed under <code>content_scripts</code>.</li>
-<li>Find the JS files listed under content_scripts. Those files are the scripts you can try to run as user-scripts in schnopdih.</li>
-<li>In schnopdih: Settings → Extensions → Install Script -> choose the JS file.</li>
-<li>If the script references <code>chrome.*</code> APIs, you'll need to port or remove those calls.</li>
-</ol>
-<p>If you want, paste the extension ID or path and I can help extract/adapt content scripts for you.</p>
-</body>
-</html>
-"""
+        self._star_timer.start()
+        self._mark_session_dirty()
 
     def _on_tab_changed(self, index: int):
+        # the status label now belongs to another tab; its next progress update must repaint
+        self._last_progress_bucket = -1
         v = self._current_view()
         if v:
             try:
@@ -1001,7 +1500,7 @@ class SchnopdihWindow(QMainWindow):
             except Exception:
                 pass
         # update star icon when switching tabs
-        QTimer.singleShot(30, self._update_star_button)
+        self._star_timer.start()
 
     def _close_tab(self, index: int):
         if index < 0 or index >= self.tabs.count():
@@ -1013,46 +1512,62 @@ class SchnopdihWindow(QMainWindow):
         try:
             url = widget.url().toString()
             if url:
-                self.closed_tabs_stack.insert(0, url)
-                self.closed_tabs_stack = self.closed_tabs_stack[:20]
+                self.closed_tabs_stack.appendleft(url)
         except Exception:
             pass
         try:
-            page = widget.page()
-            prof = page.profile() if page else None
-            cache_path = None
-            try:
-                cache_path = prof.cachePath()
-            except Exception:
-                cache_path = None
             widget.deleteLater()
             self.tabs.removeTab(index)
-            if cache_path and "schnopdih_tmp_cache_" in str(cache_path):
+        except Exception:
+            pass
+        self._mark_session_dirty()
+
+    def _get_private_profile(self) -> QWebEngineProfile:
+        if self._private_profile is None:
+            # no storage name -> off-the-record: cache and storage stay in memory, nothing to clean up
+            profile = QWebEngineProfile(self)
+            try:
+                profile.setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies)
+                profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+                profile.setCachePath("")
+                profile.setPersistentStoragePath("")
                 try:
-                    shutil.rmtree(str(cache_path), ignore_errors=True)
+                    profile.setHttpUserAgent(MODERN_USER_AGENT)
                 except Exception:
                     pass
-        except Exception:
-            pass
+            except Exception:
+                pass
+            self._install_extensions_scripts(profile)
+            self._private_profile = profile
+        return self._private_profile
 
     def _update_tab_title(self, view: SchnopdihWebView, title: str):
-        i = self.tabs.indexOf(view)
+        # most title changes come from the active tab; only background tabs need the indexOf walk
+        current = view is self.tabs.currentWidget()
+        i = self.tabs.currentIndex() if current else self.tabs.indexOf(view)
         if i >= 0:
             display = title or view.url().toString()
             display = (display[:45] + "...") if len(display) > 45 else display
-            self.tabs.setTabText(i, display)
-            if view == self._current_view():
+            # titleChanged fires in bursts during load; don't invalidate the tab bar layout for nothing
+            if self.tabs.tabText(i) != display:
+                self.tabs.setTabText(i, display)
+            if current and self.titlebar.title.text() != display:
                 self.titlebar.setTitle(display)
 
     def _update_urlbar(self, view: SchnopdihWebView, qurl: QUrl):
-        if view != self._current_view():
+        if view is not self.tabs.currentWidget():
+            return
+        text = qurl.toString()
+        # redirects/fragment hops re-report the same url; leave the line edit (and its cursor) alone
+        if self.urlbar.text() == text:
             return
         self.urlbar.blockSignals(True)
-        self.urlbar.setText(qurl.toString())
+        self.urlbar.setText(text)
         self.urlbar.blockSignals(False)
         # update star after urlbar update
-        QTimer.singleShot(10, self._update_star_button)
+        self._star_timer.start()
 
+    @pyqtSlot()
     def _on_omnibox_go(self):
         text = self.urlbar.text().strip()
         if not text:
@@ -1064,35 +1579,38 @@ class SchnopdihWindow(QMainWindow):
         except Exception:
             pass
 
+    @pyqtSlot(str)
     def _on_omnibox_edit(self, text: str):
-        text = (text or "").strip()
-        self._pending_omnibox_text = text
         try:
             self.omnibox_timer.start()
         except Exception:
             self._populate_suggestions()
 
     def _populate_suggestions(self):
-        text = self._pending_omnibox_text
+        text = self.urlbar.text().strip()
         try:
             if not text:
                 self.suggestion_list.hide()
                 return
-            bms = self.bookmarks.search(text, limit=6)
-            hs = self.history.search(text, limit=6)
-            items = []
-            for b in bms:
-                items.append((b.get('title'), b.get('url')))
-            for h in hs:
-                items.append((h.get('title'), h.get('url')))
+            bms = self.bookmarks.search(text, limit=OMNIBOX_SUGGESTIONS)
+            hs = self.history.search(text, limit=OMNIBOX_SUGGESTIONS)
+            # one row per url, bookmarks first
+            by_url = {}
+            for src in (bms, hs):
+                for r in src:
+                    by_url.setdefault(r.get('url'), r.get('title'))
+            items = [(title, url) for url, title in by_url.items()][:OMNIBOX_SUGGESTIONS]
             if not items:
                 self.suggestion_list.hide()
                 return
-            self.suggestion_list.clear()
-            for title, url in items:
-                it = QListWidgetItem(f"{title} — {url}")
-                it.setData(Qt.UserRole, url)
-                self.suggestion_list.addItem(it)
+            for i, it in enumerate(self._suggestion_pool):
+                if i < len(items):
+                    title, url = items[i]
+                    it.setText(f"{title} — {url}")
+                    it.setData(Qt.UserRole, url)
+                    it.setHidden(False)
+                else:
+                    it.setHidden(True)
             pos = self.urlbar.mapToGlobal(self.urlbar.rect().bottomLeft())
             self.suggestion_list.move(pos)
             self.suggestion_list.resize(self.urlbar.width(), min(240, 24 * (len(items) + 1)))
@@ -1113,16 +1631,21 @@ class SchnopdihWindow(QMainWindow):
         self.suggestion_list.hide()
 
     def _parse_omnibox(self, text: str) -> str:
-        parsed = urlparse(text)
-        if parsed.scheme:
+        # cheap checks for the common shapes first; urlparse only for dotless single words
+        if text.startswith(URL_PREFIXES):
+            return text
+        if " " in text:
+            return SEARCH_URL + quote_plus(text)
+        if "://" in text:
             return text
-        if "." in text and " " not in text:
-            if not parsed.netloc:
-                return "http://" + text
+        if "." in text:
+            return "http://" + text
+        if urlparse(text).scheme:
             return text
-        return "https://www.google.com/search?q=" + text.replace(" ", "+")
+        return SEARCH_URL + quote_plus(text)
 
-    def _on_load_finished(self, ok: bool, view: SchnopdihWebView):
+    def _on_load_finished(self, view: SchnopdihWebView, ok: bool):
+        self._last_progress_bucket = -1
         try:
             if not ok:
                 self.status.setText("Load failed")
@@ -1133,14 +1656,19 @@ class SchnopdihWindow(QMainWindow):
             self._update_tab_title(view, title)
             self.status.setText(title)
             # refresh bookmarks toolbar in case bookmarks changed externally
-            QTimer.singleShot(200, self.refresh_bookmarks_toolbar)
+            self._bookmarks_bar_timer.start()
         except Exception:
             pass
 
-    def _on_load_progress(self, p: int, view: SchnopdihWebView):
+    def _on_load_progress(self, view: SchnopdihWebView, p: int):
         try:
             if view != self._current_view():
                 return
+            # only repaint the status line when the 5% bucket changes
+            bucket = p // 5
+            if self._last_progress_bucket == bucket:
+                return
+            self._last_progress_bucket = bucket
             self.status.setText(f"Loading... {p}%")
             if p >= 100:
                 QTimer.singleShot(400, lambda: self.status.setText("Ready"))
@@ -1207,14 +1735,43 @@ class SchnopdihWindow(QMainWindow):
         self.downloads.add(item, path)
         show_toast(self, "Download started")
 
+    def _session_tabs(self) -> List[str]:
+        tabs = []
+        for i in range(self.tabs.count()):
+            w = self.tabs.widget(i)
+            if w and w.page().profile() is not self._private_profile:
+                tabs.append(w.url().toString())
+        return tabs
+
     def _save_session(self):
         try:
-            tabs = [self.tabs.widget(i).url().toString() for i in range(self.tabs.count()) if self.tabs.widget(i)]
-            self.session.save(tabs)
+            self.session.save(self._session_tabs())
+            self._session_dirty = False
             show_toast(self, "Session saved")
         except Exception:
             pass
 
+    def _mark_session_dirty(self):
+        # nothing to save until the previous session has been restored over the startup tab
+        if not self._session_restored:
+            return
+        self._session_dirty = True
+        self._session_timer.start()
+
+    def _flush_session(self):
+        if not self._session_dirty:
+            return
+        self._session_dirty = False
+        try:
+            self.session.save(self._session_tabs())
+        except Exception:
+            pass
+
+    def _open_initial_tabs(self):
+        self._restore_session()
+        if not self.tabs.count():
+            self.add_tab(DEFAULT_HOMEPAGE, switch=True)
+
     def _restore_session(self):
         try:
             tabs = self.session.restore()
@@ -1227,6 +1784,8 @@ class SchnopdihWindow(QMainWindow):
                 self.tabs.setCurrentIndex(0)
         except Exception:
             pass
+        finally:
+            self._session_restored = True
 
     def _apply_app_palette(self):
         pal = QPalette()
@@ -1237,7 +1796,7 @@ class SchnopdihWindow(QMainWindow):
         pal.setColor(QPalette.Button, QColor(255, 255, 255))
         pal.setColor(QPalette.ButtonText, QColor(0, 0, 0))
         QApplication.instance().setPalette(pal)
-        self.setStyleSheet(WIDGET_LIGHT_STYLE)
+        apply_stylesheet(self, WIDGET_LIGHT_STYLE)
 
     def _toggle_devtools(self):
         v = self._current_view()
@@ -1257,31 +1816,80 @@ class SchnopdihWindow(QMainWindow):
             pass
 
     # Extension loading
+    def _scan_extensions(self) -> List[Dict]:
+        # one directory + manifest scan shared with the settings dialog; set
+        # _extensions_cache to None after changing anything under EXTENSIONS_DIR
+        if self._extensions_cache is None:
+            found = []
+            try:
+                for d in EXTENSIONS_DIR.iterdir():
+                    if d.is_dir():
+                        m = d / 'manifest.json'
+                        if m.exists():
+                            data = _load_json(m, None)
+                            enabled = data.get('enabled', True) if isinstance(data, dict) else True
+                            script = d / 'content.js'
+                            found.append({'dir': d, 'meta': data, 'script': str(script) if script.exists() else None, 'enabled': enabled})
+            except Exception:
+                pass
+            self._extensions_cache = found
+        return self._extensions_cache
+
     def _load_enabled_extensions(self):
+        # read every enabled content.js once and register it on the profiles as a
+        # QWebEngineScript, so Chromium injects it natively on each navigation;
+        # text from the previous load is reused when content.js hasn't been touched
+        previous = {e['script']: e for e in getattr(self, 'extensions', []) if 'js' in e}
         self.extensions = []
+        self._extensions_scripts: List[QWebEngineScript] = []
         try:
-            for d in EXTENSIONS_DIR.iterdir():
-                if d.is_dir():
-                    m = d / 'manifest.json'
-                    script = d / 'content.js'
-                    if m.exists() and script.exists():
-                        data = _load_json(m, None)
-                        enabled = data.get('enabled', True) if isinstance(data, dict) else True
-                        self.extensions.append({'dir': d, 'meta': data, 'script': str(script), 'enabled': enabled})
+            for found in self._scan_extensions():
+                if not found['script']:
+                    continue
+                ext = dict(found)
+                self.extensions.append(ext)
+                if ext['enabled']:
+                    try:
+                        script = Path(ext['script'])
+                        mtime = script.stat().st_mtime
+                        cached = previous.get(ext['script'])
+                        if cached and cached.get('mtime') == mtime:
+                            ext['js'] = cached['js']
+                        else:
+                            ext['js'] = script.read_bytes().decode('utf-8')
+                        ext['mtime'] = mtime
+                        qs = self._build_extension_script(ext['dir'].name, ext['js'])
+                        if qs is not None:
+                            self._extensions_scripts.append(qs)
+                    except Exception:
+                        pass
         except Exception:
             pass
+        self._install_extensions_scripts(self.profile)
+        if self._private_profile is not None:
+            self._install_extensions_scripts(self._private_profile)
 
-    def _inject_extensions_into_view(self, view: SchnopdihWebView):
+    def _build_extension_script(self, name: str, js: str) -> Optional[QWebEngineScript]:
+        # one script per extension so a syntax error in one doesn't take the others down
         try:
-            for ext in getattr(self, 'extensions', []):
-                if not ext.get('enabled'):
-                    continue
-                try:
-                    with open(ext.get('script'), 'r', encoding='utf-8') as f:
-                        js = f.read()
-                    view.page().runJavaScript(js)
-                except Exception:
-                    pass
+            s = QWebEngineScript()
+            s.setName(f"{EXTENSIONS_SCRIPT_NAME}:{name}")
+            s.setSourceCode("(function(){\n" + js + "\n})();")
+            s.setInjectionPoint(QWebEngineScript.DocumentReady)
+            s.setWorldId(QWebEngineScript.MainWorld)
+            s.setRunsOnSubFrames(False)
+            return s
+        except Exception:
+            return None
+
+    def _install_extensions_scripts(self, profile: QWebEngineProfile):
+        try:
+            scripts = profile.scripts()
+            for old in scripts.toList():
+                if old.name().startswith(EXTENSIONS_SCRIPT_NAME + ":"):
+                    scripts.remove(old)
+            for qs in getattr(self, '_extensions_scripts', []):
+                scripts.insert(qs)
         except Exception:
             pass
 
@@ -1292,13 +1900,17 @@ class SchnopdihWindow(QMainWindow):
         dlg.exec_()
 
     def _show_history(self):
-        dlg = QListWidget()
+        dlg = QListView()
         dlg.setWindowTitle("History")
-        for h in self.history.history[:1000]:
-            it = QListWidgetItem(f"{h.get('title')} — {h.get('url')}")
-            it.setData(Qt.UserRole, h.get('url'))
-            dlg.addItem(it)
-        dlg.itemDoubleClicked.connect(lambda it: self.add_tab(it.data(Qt.UserRole), switch=True))
+        dlg.setUniformItemSizes(True)
+        # backed by the live history deque: the view only materializes visible rows, so no cap
+        model = UrlListModel(self.history, dlg)
+        dlg.setModel(model)
+        self.history.listeners.append(model.entry_prepended)
+        self.history.head_listeners.append(model.head_changed)
+        dlg.destroyed.connect(lambda _: self.history.listeners.remove(model.entry_prepended))
+        dlg.destroyed.connect(lambda _: self.history.head_listeners.remove(model.head_changed))
+        dlg.doubleClicked.connect(self._open_index_tab)
         dlg.resize(700, 420)
         dlg.show()
         self._track_dialog(dlg)
@@ -1306,16 +1918,27 @@ class SchnopdihWindow(QMainWindow):
     def _show_downloads(self):
         dlg = QListWidget()
         dlg.setWindowTitle("Downloads")
-        # small refresh timer to update progress
+        # small refresh timer to update progress; rows are kept per record and only relabelled
+        rows: Dict[DownloadRecord, QListWidgetItem] = {}
         def refresh():
-            dlg.clear()
+            live = set()
             for dr in self.downloads.active:
+                live.add(dr)
                 label = f"{Path(dr.dest).name} — {dr.progress}%{' (done)' if dr.finished else ''}"
-                it = QListWidgetItem(label)
-                dlg.addItem(it)
+                it = rows.get(dr)
+                if it is None:
+                    it = QListWidgetItem(label)
+                    rows[dr] = it
+                    dlg.addItem(it)
+                elif it.text() != label:
+                    it.setText(label)
+            # drop rows for records the manager no longer tracks (cleanup_finished)
+            for key in [k for k in rows if k not in live]:
+                dlg.takeItem(dlg.row(rows.pop(key)))
         refresh()
         timer = QTimer(dlg)
-        timer.setInterval(500)
+        timer.setInterval(1000)
+        timer.setTimerType(Qt.CoarseTimer)
         timer.timeout.connect(refresh)
         timer.start()
         dlg.resize(560, 300)
@@ -1325,13 +1948,11 @@ class SchnopdihWindow(QMainWindow):
     def _show_reading_list(self):
         path = DATA_DIR / "reading_list.json"
         items = _load_json(path, []) or []
-        dlg = QListWidget()
+        dlg = QListView()
         dlg.setWindowTitle("Reading List")
-        for itn in items:
-            it = QListWidgetItem(f"{itn.get('title')} — {itn.get('url')}")
-            it.setData(Qt.UserRole, itn.get('url'))
-            dlg.addItem(it)
-        dlg.itemDoubleClicked.connect(lambda it: self.add_tab(it.data(Qt.UserRole), switch=True))
+        dlg.setUniformItemSizes(True)
+        dlg.setModel(UrlListModel(items, dlg))
+        dlg.doubleClicked.connect(self._open_index_tab)
         dlg.resize(640, 380)
         dlg.show()
         self._track_dialog(dlg)
@@ -1346,7 +1967,7 @@ class SchnopdihWindow(QMainWindow):
     def _reopen_closed_tab(self):
         if not self.closed_tabs_stack:
             return
-        url = self.closed_tabs_stack.pop(0)
+        url = self.closed_tabs_stack.popleft()
         if url:
             self.add_tab(url, switch=True)
 
@@ -1387,6 +2008,8 @@ class SchnopdihWindow(QMainWindow):
 # Settings dialog (General / Privacy / Extensions with instructions)
 # -------------------------
 class SettingsDialog(QDialog):
+    cacheCleared = pyqtSignal(bool)
+
     def __init__(self, parent: SchnopdihWindow):
         super().__init__(parent)
         self.setWindowTitle('Settings')
@@ -1400,6 +2023,13 @@ class SettingsDialog(QDialog):
         self._build_general_tab()
         self._build_privacy_tab()
         self._build_extensions_tab()
+        # emitted from the pool thread, so this is delivered queued on the GUI thread
+        self.cacheCleared.connect(self._on_cache_cleared)
+
+    def reload(self):
+        # the dialog is reused between opens; pick up anything that changed while it was closed
+        self.home_input.setText(DEFAULT_HOMEPAGE)
+        self._refresh_extensions()
 
     def _build_general_tab(self):
         w = QWidget()
@@ -1434,27 +2064,49 @@ class SettingsDialog(QDialog):
     def _build_privacy_tab(self):
         w = QWidget()
         layout = QVBoxLayout(w)
-        btn_clear_cache = QPushButton('Clear Cache', self)
-        btn_clear_storage = QPushButton('Clear Storage', self)
-        btn_clear_cache.clicked.connect(self._clear_cache)
-        btn_clear_storage.clicked.connect(self._clear_storage)
-        layout.addWidget(btn_clear_cache)
-        layout.addWidget(btn_clear_storage)
+        self.btn_clear_cache = QPushButton('Clear Cache', self)
+        self.btn_clear_storage = QPushButton('Clear Storage', self)
+        self.btn_clear_cache.clicked.connect(self._clear_cache)
+        self.btn_clear_storage.clicked.connect(self._clear_storage)
+        layout.addWidget(self.btn_clear_cache)
+        layout.addWidget(self.btn_clear_storage)
         layout.addStretch()
         self.tabs.addTab(w, 'Privacy')
 
     def _clear_cache(self):
+        # the delete can take a while on a big profile; run it on the global pool (not the serial
+        # one, so history/session writes aren't stuck behind it) and keep the buttons off meanwhile
+        if not self.btn_clear_cache.isEnabled():
+            return
+        self._start_clear([CACHE_DIR] + [STORAGE_DIR / d for d in STORAGE_CACHE_SUBDIRS], 'Cache cleared')
+
+    def _start_clear(self, dirs: List[Path], done_message: str):
+        self._clear_message = done_message
+        self.btn_clear_cache.setEnabled(False)
+        self.btn_clear_storage.setEnabled(False)
+        QThreadPool.globalInstance().start(_Task(self._clear_cache_job, dirs))
+
+    def _clear_cache_job(self, dirs: List[Path]):
+        # pool thread: no widgets here, report back through the signal
+        ok = True
         try:
-            if CACHE_DIR.exists():
-                shutil.rmtree(str(CACHE_DIR), ignore_errors=True)
-            if STORAGE_DIR.exists():
-                shutil.rmtree(str(STORAGE_DIR), ignore_errors=True)
-            show_toast(self.parent, 'Cache & storage cleared')
+            for d in dirs:
+                if d.exists():
+                    _fast_rm(d)
         except Exception:
-            show_toast(self.parent, 'Failed to clear cache')
+            ok = False
+        self.cacheCleared.emit(ok)
+
+    def _on_cache_cleared(self, ok: bool):
+        self.btn_clear_cache.setEnabled(True)
+        self.btn_clear_storage.setEnabled(True)
+        show_toast(self.parent, self._clear_message if ok else 'Failed to clear cache')
 
     def _clear_storage(self):
-        self._clear_cache()
+        # everything: cookies, logins and site data go too
+        if not self.btn_clear_storage.isEnabled():
+            return
+        self._start_clear([CACHE_DIR, STORAGE_DIR], 'Cache & storage cleared')
 
     def _build_extensions_tab(self):
         w = QWidget()
@@ -1511,16 +2163,13 @@ If you want, paste the extension ID or path and I can help extract/adapt content
 
     def _refresh_extensions(self):
         self.ext_list.clear()
-        for d in EXTENSIONS_DIR.iterdir():
-            if d.is_dir():
-                m = d / 'manifest.json'
-                if m.exists():
-                    data = _load_json(m, {})
-                    name = data.get('name', d.name)
-                    enabled = data.get('enabled', True)
-                    it = QListWidgetItem(f"{name} {'(enabled)' if enabled else '(disabled)'}")
-                    it.setData(Qt.UserRole, str(d))
-                    self.ext_list.addItem(it)
+        for ext in self.parent._scan_extensions():
+            d = ext['dir']
+            meta = ext['meta'] if isinstance(ext['meta'], dict) else {}
+            name = meta.get('name', d.name)
+            it = QListWidgetItem(f"{name} {'(enabled)' if ext['enabled'] else '(disabled)'}")
+            it.setData(Qt.UserRole, str(d))
+            self.ext_list.addItem(it)
 
     def _install_script(self):
         path, _ = QFileDialog.getOpenFileName(self, 'Choose JS file', str(Path.home()), 'JavaScript files (*.js)')
@@ -1532,8 +2181,9 @@ If you want, paste the extension ID or path and I can help extract/adapt content
             dest.mkdir(exist_ok=True)
             shutil.copy(path, dest / 'content.js')
             m = {'name': name, 'enabled': True, 'installed': _now_iso()}
-            _save_json(dest / 'manifest.json', m)
+            _save_json(dest / 'manifest.json', m, pretty=True)
             show_toast(self.parent, 'Script installed')
+            self.parent._extensions_cache = None
             self._refresh_extensions()
             self.parent._load_enabled_extensions()
         except Exception:
@@ -1547,6 +2197,7 @@ If you want, paste the extension ID or path and I can help extract/adapt content
         try:
             shutil.rmtree(d, ignore_errors=True)
             show_toast(self.parent, 'Removed')
+            self.parent._extensions_cache = None
             self._refresh_extensions()
             self.parent._load_enabled_extensions()
         except Exception:
@@ -1558,9 +2209,19 @@ If you want, paste the extension ID or path and I can help extract/adapt content
             return
         d = Path(it.data(Qt.UserRole))
         m = d / 'manifest.json'
-        data = _load_json(m, {})
+        # flip the cached manifest instead of re-reading it, and patch the cache entry in place
+        ext = next((e for e in self.parent._scan_extensions() if e['dir'] == d), None)
+        if ext is not None and isinstance(ext['meta'], dict):
+            data = dict(ext['meta'])
+        else:
+            data = _load_json(m, {})
         data['enabled'] = not data.get('enabled', True)
-        _save_json(m, data)
+        _save_json(m, data, pretty=True)
+        if ext is not None:
+            ext['meta'] = data
+            ext['enabled'] = data['enabled']
+        else:
+            self.parent._extensions_cache = None
         show_toast(self.parent, 'Toggled')
         self._refresh_extensions()
         self.parent._load_enabled_extensions()
@@ -1572,23 +2233,13 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("schnopdih")
 
+    # the window configures the default profile (paths, cache cap, UA) before any view exists
     window = SchnopdihWindow()
 
     window.show()
     window.raise_()
     window.activateWindow()
 
-    try:
-        prof = QWebEngineProfile.defaultProfile()
-        prof.setCachePath(str(CACHE_DIR))
-        prof.setPersistentStoragePath(str(STORAGE_DIR))
-        try:
-            prof.setHttpUserAgent(MODERN_USER_AGENT)
-        except Exception:
-            pass
-    except Exception:
-        pass
-
     sys.exit(app.exec_())
 
 